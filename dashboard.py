@@ -1,19 +1,196 @@
 #!/usr/bin/env python3
 import subprocess
 import pygame
+import numpy as np
 import os
+import signal
 import time
-import glob
+import io
+import json
+import base64
 import logging
-from datetime import datetime, time as dt_time
-import schedule
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+import websocket
 
 # Configure logging
+log_level = os.getenv('LOG_LEVEL', 'INFO').upper()
 logging.basicConfig(
-    level=logging.INFO,
+    level=logging.getLevelNamesMapping().get(log_level, logging.INFO),
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
+if log_level not in logging.getLevelNamesMapping():
+    logger.warning("Invalid log level %s, defaulting to INFO", log_level)
+
+# Flags shared by the persistent and one-shot headless Chromium launches
+CHROMIUM_FLAGS = [
+    '--disable-gpu',
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-software-rasterizer',
+    '--run-all-compositor-stages-before-draw',
+    '--hide-scrollbars',
+    '--force-color-profile=srgb',
+    '--disable-features=TranslateUI,BackForwardCache'
+]
+
+def kill_process_group(proc):
+    """Kill a process started with start_new_session and any children it left behind"""
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+    # Reaps the process and closes its pipes
+    proc.communicate()
+
+class ChromiumSession:
+    """Long-lived headless Chromium driven over the DevTools protocol"""
+
+    def __init__(self, chromium_path, width, height, port, timeout, virtual_time_budget=0,
+                 image_format='png', quality=None):
+        self.chromium_path = chromium_path
+        self.width = width
+        self.height = height
+        self.port = port
+        self.timeout = timeout
+        self.virtual_time_budget = virtual_time_budget
+        self.image_format = image_format
+        self.quality = quality
+        self.captures = 0
+        self._process = None
+        self._ws = None
+        self._next_id = 0
+
+    def start(self):
+        """Launch Chromium and attach to its page target"""
+        cmd = [
+            self.chromium_path,
+            '--headless=new',
+            *CHROMIUM_FLAGS,
+            f'--remote-debugging-port={self.port}',
+            f'--window-size={self.width},{self.height}',
+            'about:blank'
+        ]
+        self._process = subprocess.Popen(cmd, start_new_session=True)
+
+        try:
+            ws_url = self._find_page_target()
+            self._ws = websocket.create_connection(ws_url, timeout=self.timeout, suppress_origin=True)
+            self._call('Page.enable')
+            self._call('Emulation.setDeviceMetricsOverride', {
+                'width': self.width,
+                'height': self.height,
+                'deviceScaleFactor': 1,
+                'mobile': False
+            })
+        except Exception:
+            self.close()
+            raise
+
+        self.captures = 0
+        logger.info("Persistent Chromium started (pid %s, port %s)", self._process.pid, self.port)
+
+    @property
+    def running(self):
+        return self._process is not None
+
+    def _find_page_target(self):
+        """Poll the DevTools endpoint until the page target is available"""
+        deadline = time.monotonic() + self.timeout
+        last_error = None
+        while time.monotonic() < deadline:
+            if self._process.poll() is not None:
+                raise RuntimeError(f"Chromium exited with code {self._process.returncode}")
+            try:
+                with urllib.request.urlopen(f'http://127.0.0.1:{self.port}/json/list', timeout=1) as response:
+                    targets = json.load(response)
+                for target in targets:
+                    if target.get('type') == 'page':
+                        return target['webSocketDebuggerUrl']
+            except OSError as e:
+                last_error = e
+            time.sleep(0.2)
+
+        raise RuntimeError(f"DevTools endpoint not available after {self.timeout}s: {last_error}")
+
+    def _call(self, method, params=None, wait_event=None):
+        """Send a DevTools command and return its result
+
+        If wait_event is given, also wait for that event to fire.
+        """
+        self._next_id += 1
+        message_id = self._next_id
+        ws = self._ws
+        ws.send(json.dumps({'id': message_id, 'method': method, 'params': params or {}}))
+
+        deadline = time.monotonic() + self.timeout
+        result = None
+        while result is None or wait_event:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"DevTools {method} timed out after {self.timeout}s")
+            ws.settimeout(remaining)
+            try:
+                message = json.loads(ws.recv())
+            except websocket.WebSocketTimeoutException:
+                raise TimeoutError(f"DevTools {method} timed out after {self.timeout}s") from None
+            if message.get('id') == message_id:
+                if 'error' in message:
+                    raise RuntimeError(f"DevTools {method} failed: {message['error'].get('message')}")
+                result = message.get('result', {})
+            elif result is not None and message.get('method') == wait_event:
+                # Events queued before the response belong to the previous page
+                wait_event = None
+
+        return result
+
+    def capture(self, url):
+        """Navigate to url and return an encoded screenshot as bytes"""
+        self._call('Page.navigate', {'url': url}, wait_event='Page.loadEventFired')
+        if self.virtual_time_budget:
+            # Fast-forward timers and animations instead of waiting them out,
+            # the DevTools equivalent of --virtual-time-budget
+            try:
+                self._call('Emulation.setVirtualTimePolicy', {
+                    'policy': 'pauseIfNetworkFetchesPending',
+                    'budget': self.virtual_time_budget
+                }, wait_event='Emulation.virtualTimeBudgetExpired')
+            except TimeoutError as e:
+                # A fetch that never finishes (SSE, long-poll) keeps virtual
+                # time paused; screenshot the page as it is
+                logger.debug("Virtual time budget did not expire: %s", e)
+        params = {'format': self.image_format}
+        if self.image_format != 'png' and self.quality is not None:
+            params['quality'] = self.quality
+        result = self._call('Page.captureScreenshot', params)
+        if self.virtual_time_budget:
+            # Virtual time stays paused once the budget runs out; let the
+            # next navigation load in real time again
+            self._call('Emulation.setVirtualTimePolicy', {'policy': 'advance'})
+        self.captures += 1
+        return base64.b64decode(result['data'])
+
+    def close(self):
+        """Close the DevTools connection and stop Chromium"""
+        # Take each handle before using it, as a failing capture on the worker
+        # may be closing the session while the main thread shuts down
+        ws, self._ws = self._ws, None
+        if ws is not None:
+            try:
+                ws.close()
+            except Exception:
+                pass
+
+        process, self._process = self._process, None
+        if process is not None:
+            process.terminate()
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                pass
+            kill_process_group(process)
 
 class ScreenDashboard:
     def __init__(self):
@@ -26,6 +203,15 @@ class ScreenDashboard:
         self.night_start = os.getenv('NIGHT_START', '22:00')
         self.night_end = os.getenv('NIGHT_END', '07:00')
 
+        # Parse night hours once into minutes since midnight; an invalid
+        # format disables night mode
+        try:
+            self._night_start_min = self._parse_minutes(self.night_start)
+            self._night_end_min = self._parse_minutes(self.night_end)
+        except ValueError as e:
+            logger.error("Invalid time format: %s", e)
+            self.night_mode_enabled = False
+
         # Display settings
         self.window_width = int(os.getenv('WINDOW_WIDTH', '800'))
         self.window_height = int(os.getenv('WINDOW_HEIGHT', '600'))
@@ -33,28 +219,144 @@ class ScreenDashboard:
 
         # Validate rotation
         if self.rotation not in [0, 90, 180, 270]:
-            logger.warning(f"Invalid rotation {self.rotation}, defaulting to 0")
+            logger.warning("Invalid rotation %s, defaulting to 0", self.rotation)
             self.rotation = 0
 
+        # Quarter turns for np.rot90; surfarrays are indexed (x, y), so rotating
+        # from axis 1 to axis 0 matches pygame's counter-clockwise direction
+        self._rotation_k = self.rotation // 90
+
         # Chromium settings
         self.chromium_path = os.getenv('CHROMIUM_PATH', 'chromium-browser')
         self.chromium_timeout = int(os.getenv('CHROMIUM_TIMEOUT', '30'))
-        self.screenshot_path = os.getenv('SCREENSHOT_PATH', '/tmp/screenshot.png')
+        self.screenshot_path = os.getenv('SCREENSHOT_PATH', '')  # Optional copy for debugging
+        self.chromium_persistent = os.getenv('CHROMIUM_PERSISTENT', 'true').lower() == 'true'
+        self.chromium_debug_port = int(os.getenv('CHROMIUM_DEBUG_PORT', '9222'))
+        self.chromium_recycle = int(os.getenv('CHROMIUM_RECYCLE', '100'))
+        self.virtual_time_budget = int(os.getenv('CHROMIUM_VIRTUAL_TIME_BUDGET', '5000'))  # ms, 0 disables
+
+        # JPEG decodes much faster than PNG; only the DevTools path can request it
+        self.screenshot_format = os.getenv('SCREENSHOT_FORMAT', 'jpeg').lower()
+        self.screenshot_quality = int(os.getenv('SCREENSHOT_QUALITY', '85'))
+        if self.screenshot_format not in ['png', 'jpeg', 'webp']:
+            logger.warning("Invalid screenshot format %s, defaulting to jpeg", self.screenshot_format)
+            self.screenshot_format = 'jpeg'
+
+        # Screenshot cache settings
+        self.cache_enabled = os.getenv('CACHE_ENABLED', 'false').lower() == 'true'
+        self._last_etag = None
+        self._last_screenshot = None
+        self._cached_surface = None
+        self._cached_screenshot = None
+
+        # What is currently on screen, so unchanged frames are not redrawn
+        self._shown_screenshot = None
+        self._screen_on = True
+
+        # Rotate and scale kernel for the current sizes, built on first use
+        self._xform = None
 
         # Backlight settings
         self.backlight_path = os.getenv('BACKLIGHT_PATH', '')
         self.backlight_max = int(os.getenv('BACKLIGHT_MAX', '255'))
 
         # Auto-detect backlight if not specified
+        self.state_path = os.getenv('STATE_PATH', '/var/lib/chopper-screen/state.json')
         if not self.backlight_path:
-            backlight_devices = glob.glob('/sys/class/backlight/*/brightness')
-            if backlight_devices:
-                self.backlight_path = backlight_devices[0]
-                logger.info(f"Auto-detected backlight device: {self.backlight_path}")
+            self.backlight_path = self._detect_backlight()
+
+        # Keep the sysfs file open and remember the last value written
+        self._backlight_fd = None
+        self._last_backlight = None
+        if self.backlight_path:
+            try:
+                self._backlight_fd = os.open(self.backlight_path, os.O_WRONLY)
+            except OSError as e:
+                logger.warning("Failed to open backlight %s: %s", self.backlight_path, e)
 
         # Initialize pygame with appropriate video driver
         self.screen = self._initialize_display()
-        logger.info(f"Dashboard initialized - URL: {self.url}, Refresh: {self.refresh_interval}s")
+        # Blits only take SDL's fast path when source and screen formats match
+        self._display_format = (self.screen.get_bitsize(), self.screen.get_masks())
+
+        # Every rotated or scaled frame is written into this one surface
+        self._dest_surface = pygame.Surface(self.screen.get_size(), 0, self.screen)
+
+        # Screenshots are captured on a worker thread so the main loop stays free
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='capture')
+        self._capture = None
+        self._refresh_lock = threading.Lock()
+        self._last_refresh_start = None
+        self._wakeup = threading.Event()
+        self._last_state = None
+
+        # Optional change notifications; while subscribed, refreshes only
+        # capture after a message arrives, otherwise every refresh captures
+        self.change_url = os.getenv('CHANGE_WEBHOOK_URL', '')
+        self._dirty = True
+        self._retry_capture = False
+        self._change_listener = None
+        if self.change_url:
+            self._start_change_listener()
+
+        # Start the long-lived browser, falling back to one-shot Chromium runs
+        self.browser = None
+        if self.chromium_persistent:
+            self.browser = self._start_browser()
+        logger.info("Dashboard initialized - URL: %s, Refresh: %ds", self.url, self.refresh_interval)
+
+    @staticmethod
+    def _parse_minutes(value):
+        """Parse HH:MM (seconds are ignored) into minutes since midnight"""
+        parts = value.split(':')
+        try:
+            hours, minutes = int(parts[0]), int(parts[1])
+        except (IndexError, ValueError):
+            raise ValueError(f"Invalid time {value!r}, expected HH:MM") from None
+        if not (0 <= hours < 24 and 0 <= minutes < 60):
+            raise ValueError(f"Invalid time {value!r}, expected HH:MM")
+        return hours * 60 + minutes
+
+    def _load_state(self):
+        """Load values saved by a previous run"""
+        try:
+            with open(self.state_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self, state):
+        """Save values for the next run"""
+        try:
+            os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+            with open(self.state_path, 'w') as f:
+                json.dump(state, f)
+        except OSError as e:
+            logger.debug("Could not save state to %s: %s", self.state_path, e)
+
+    def _detect_backlight(self):
+        """Find the backlight brightness file, reusing the one found on a previous run"""
+        state = self._load_state()
+        path = state.get('backlight_path', '')
+        if path and os.path.exists(path):
+            return path
+
+        path = ''
+        try:
+            with os.scandir('/sys/class/backlight') as entries:
+                for entry in entries:
+                    brightness = os.path.join(entry.path, 'brightness')
+                    if os.path.exists(brightness):
+                        path = brightness
+                        break
+        except OSError:
+            pass
+
+        if path:
+            logger.info("Auto-detected backlight device: %s", path)
+            state['backlight_path'] = path
+            self._save_state(state)
+        return path
 
     def _initialize_display(self):
         """Initialize pygame display with fallback drivers"""
@@ -71,89 +373,328 @@ class ScreenDashboard:
         last_error = None
         for driver in drivers:
             try:
-                logger.info(f"Attempting to initialize display with driver: {driver}")
+                logger.info("Attempting to initialize display with driver: %s", driver)
                 os.environ['SDL_VIDEODRIVER'] = driver
                 pygame.init()
 
-                if fullscreen:
-                    screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-                else:
-                    screen = pygame.display.set_mode((self.window_width, self.window_height))
-
-                logger.info(f"Successfully initialized display with driver: {driver}")
+                try:
+                    screen = self._set_scaled_mode(fullscreen)
+                except pygame.error as e:
+                    # Not every driver can provide a renderer; scale on the CPU instead
+                    logger.warning("Scaled mode unavailable with driver %s: %s", driver, e)
+                    pygame.display.quit()
+                    pygame.display.init()
+                    if fullscreen:
+                        screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+                    else:
+                        screen = pygame.display.set_mode((self.window_width, self.window_height))
+
+                logger.info("Successfully initialized display with driver: %s", driver)
                 return screen
 
             except pygame.error as e:
                 last_error = e
-                logger.warning(f"Driver {driver} failed: {e}")
+                logger.warning("Driver %s failed: %s", driver, e)
                 pygame.quit()
                 continue
 
         # If all drivers failed, raise the last error
         raise RuntimeError(f"Failed to initialize display with any driver. Last error: {last_error}")
 
-    def take_screenshot(self):
-        """Take screenshot of webpage using headless chrome"""
+    def _set_scaled_mode(self, fullscreen):
+        """Open a screenshot-sized logical screen that SDL scales to the panel"""
+        size = (self.window_width, self.window_height)
+        if self._rotation_k % 2:
+            size = (self.window_height, self.window_width)
+
+        flags = pygame.SCALED
+        if fullscreen:
+            flags |= pygame.FULLSCREEN
+
+        return pygame.display.set_mode(size, flags, vsync=1)
+
+    def _start_browser(self):
+        """Start a persistent Chromium session, None if it cannot be started"""
+        browser = ChromiumSession(
+            self.chromium_path,
+            self.window_width,
+            self.window_height,
+            self.chromium_debug_port,
+            self.chromium_timeout,
+            self.virtual_time_budget,
+            self.screenshot_format,
+            self.screenshot_quality
+        )
+        try:
+            browser.start()
+            return browser
+        except Exception as e:
+            logger.warning("Persistent Chromium unavailable, using one-shot runs: %s", e)
+            return None
+
+    def _capture_with_browser(self):
+        """Take screenshot through the persistent Chromium session"""
+        # Restart periodically so Chromium's memory use does not creep up
+        if self.browser.captures >= self.chromium_recycle:
+            logger.info("Recycling Chromium after %d screenshots", self.browser.captures)
+            self.browser.close()
+
+        if not self.browser.running:
+            self.browser.start()
+
+        try:
+            return self.browser.capture(self.url)
+        except Exception as e:
+            logger.error("Persistent Chromium capture failed: %s", e)
+            # Start from a clean browser on the next refresh
+            self.browser.close()
+            raise
+
+    def _start_change_listener(self):
+        """Subscribe to CHANGE_WEBHOOK_URL on a background thread"""
+        def on_open(ws):
+            logger.info("Subscribed to change notifications at %s", self.change_url)
+
+        def on_reconnect(ws):
+            on_open(ws)
+            # Changes may have been missed while disconnected
+            self.mark_dirty()
+
+        def on_message(ws, message):
+            logger.debug("Change notification received")
+            self.mark_dirty()
+
+        def on_error(ws, error):
+            logger.warning("Change notification error: %s", error)
+
+        self._change_listener = websocket.WebSocketApp(
+            self.change_url,
+            on_open=on_open,
+            on_reconnect=on_reconnect,
+            on_message=on_message,
+            on_error=on_error
+        )
+        thread = threading.Thread(
+            target=self._change_listener.run_forever,
+            kwargs={'reconnect': 5},
+            name='changes',
+            daemon=True
+        )
+        thread.start()
+
+    @property
+    def subscribed(self):
+        """Whether the change notification connection is currently up"""
+        listener = self._change_listener
+        return listener is not None and listener.sock is not None and listener.sock.connected
+
+    def mark_dirty(self):
+        """Note that the page changed and wake the main loop"""
+        self._dirty = True
+        self._wakeup.set()
+
+    def change_pending(self):
+        """Check if a change notification is waiting for a screenshot"""
+        return self.subscribed and self._dirty and self._last_state == 'day' and not self._refresh_lock.locked()
+
+    def close(self):
+        """Stop the capture thread and release the persistent browser"""
+        if self._change_listener is not None:
+            self._change_listener.close()
+        # Close the browser before joining, so an in-flight capture fails
+        # at once instead of waiting out its DevTools timeouts
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self.browser is not None:
+            self.browser.close()
+        self._executor.shutdown(wait=True)
+        self.browser = None
+        if self._backlight_fd is not None:
+            os.close(self._backlight_fd)
+            self._backlight_fd = None
+
+    def _fetch_etag(self):
+        """Fetch the page's ETag (or Last-Modified) header, None if unavailable"""
+        request = urllib.request.Request(self.url, method='HEAD')
+        try:
+            with urllib.request.urlopen(request, timeout=self.chromium_timeout) as response:
+                return response.headers.get('ETag') or response.headers.get('Last-Modified')
+        except Exception as e:
+            logger.debug("Could not fetch page validators: %s", e)
+            return None
+
+    def _capture_with_subprocess(self):
+        """Take screenshot with a one-shot headless chrome run"""
         cmd = [
             self.chromium_path,
             '--headless',
-            '--disable-gpu',
-            '--no-sandbox',
-            '--disable-dev-shm-usage',
-            '--disable-software-rasterizer',
-            f'--screenshot={self.screenshot_path}',
+            *CHROMIUM_FLAGS,
+            '--screenshot=/dev/stdout',
             f'--window-size={self.window_width},{self.window_height}',
             self.url
         ]
+        if self.virtual_time_budget:
+            cmd.insert(-1, f'--virtual-time-budget={self.virtual_time_budget}')
 
+        # Own process group, so a hung run can be killed along with its helpers
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, start_new_session=True)
         try:
-            subprocess.run(cmd, check=True, timeout=self.chromium_timeout)
-            logger.info(f"Screenshot captured: {self.screenshot_path}")
-            return self.screenshot_path
+            stdout, _ = proc.communicate(timeout=self.chromium_timeout)
         except subprocess.TimeoutExpired:
-            logger.error(f"Screenshot timed out after {self.chromium_timeout}s")
-            raise
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Chromium failed with exit code {e.returncode}")
+            logger.error("Screenshot timed out after %ds", self.chromium_timeout)
             raise
+        finally:
+            kill_process_group(proc)
 
-    def display_image(self, image_path):
-        """Display image on framebuffer"""
-        try:
-            image = pygame.image.load(image_path)
+        if proc.returncode != 0:
+            logger.error("Chromium failed with exit code %d", proc.returncode)
+            raise subprocess.CalledProcessError(proc.returncode, cmd)
+        if not stdout:
+            raise RuntimeError("Chromium did not produce a screenshot")
+        return stdout
 
-            # Apply rotation if set
-            if self.rotation != 0:
+    def take_screenshot(self):
+        """Take screenshot of webpage using headless chrome, returning image bytes"""
+        etag = None
+        if self.cache_enabled:
+            etag = self._fetch_etag()
+            if etag and etag == self._last_etag and self._last_screenshot is not None:
+                logger.debug("Page unchanged since last capture, reusing screenshot")
+                return self._last_screenshot
+
+        if self.browser is not None:
+            data = self._capture_with_browser()
+        else:
+            data = self._capture_with_subprocess()
+
+        if self.cache_enabled:
+            self._last_etag = etag
+            self._last_screenshot = data
+
+        if self.screenshot_path:
+            with open(self.screenshot_path, 'wb') as f:
+                f.write(data)
+
+        logger.debug("Screenshot captured (%d bytes)", len(data))
+        return data
+
+    def _transform(self, image):
+        """Rotate and scale image to the screen size in a single pixel pass"""
+        target_size = self._dest_surface.get_size()
+        if not self._rotation_k and image.get_size() == target_size:
+            return image
+
+        # 32-bit surfaces use a gather kernel built once for these sizes
+        if image.get_bytesize() == 4 and self.screen.get_bytesize() == 4:
+            key = (image.get_size(), image.get_pitch())
+            if self._xform is None or self._xform[0] != key:
+                self._xform = (key, self._build_transform(image))
+            return self._xform[1](image)
+
+        # pixels3d cannot reference 8 or 16-bit surfaces; let pygame do those
+        if image.get_bytesize() < 3:
+            if self._rotation_k:
                 image = pygame.transform.rotate(image, self.rotation)
-                logger.debug(f"Image rotated by {self.rotation} degrees")
-
-            # Scale to screen size
-            screen_size = self.screen.get_size()
-            image = pygame.transform.scale(image, screen_size)
-
-            self.screen.blit(image, (0, 0))
-            pygame.display.flip()
-            logger.info("Image displayed successfully")
+            return pygame.transform.scale(image, target_size, self._dest_surface)
+
+        # np.rot90 only reorders strides, so rotating is free until the pixels
+        # are gathered; scaling then picks nearest source pixels from that view
+        pixels = pygame.surfarray.pixels3d(image)
+        if self._rotation_k:
+            pixels = np.rot90(pixels, self._rotation_k, axes=(1, 0))
+
+        width, height = target_size
+        if pixels.shape[:2] != (width, height):
+            xs = np.arange(width) * pixels.shape[0] // width
+            ys = np.arange(height) * pixels.shape[1] // height
+            pixels = pixels[xs[:, np.newaxis], ys]
+
+        pygame.surfarray.blit_array(self._dest_surface, pixels)
+        return self._dest_surface
+
+    def _build_transform(self, image):
+        """Build a rotate and scale kernel specialised for image's size and pitch
+
+        The source offset of every target pixel is worked out here, so each
+        refresh is one np.take between the raw 32-bit pixel buffers.
+        """
+        src_width, src_height = image.get_size()
+        out = self._dest_surface
+        width, height = out.get_size()
+        out_pitch = out.get_pitch() // 4
+
+        # Offsets into the source buffer, indexed (x, y) like a surfarray, then
+        # rotated and scaled with the same rot90 view and nearest-pixel pick
+        offsets = (np.arange(src_width)[:, np.newaxis]
+                   + np.arange(src_height)[np.newaxis, :] * (image.get_pitch() // 4))
+        offsets = np.rot90(offsets, self._rotation_k, axes=(1, 0))
+        xs = np.arange(width) * offsets.shape[0] // width
+        ys = np.arange(height) * offsets.shape[1] // height
+        # Row-major (y, x) to match the destination buffer layout
+        offsets = np.ascontiguousarray(offsets[xs[:, np.newaxis], ys].T)
+
+        def transform(source):
+            # Buffer views lock their surfaces, so only hold them for the copy
+            src = np.frombuffer(source.get_buffer(), dtype=np.uint32)
+            dst = np.frombuffer(out.get_buffer(), dtype=np.uint32).reshape(height, out_pitch)
+            np.take(src, offsets, out=dst[:, :width], mode='clip')
+            return out
+
+        logger.debug("Built transform %dx%d -> %dx%d", src_width, src_height, width, height)
+        return transform
+
+    def _decode(self, data):
+        """Decode image bytes into a surface in the display's pixel format"""
+        image = pygame.image.load(io.BytesIO(data))
+        if image.get_flags() & pygame.SRCALPHA:
+            return image.convert_alpha()
+        if (image.get_bitsize(), image.get_masks()) == self._display_format:
+            return image
+        return image.convert()
+
+    def display_image(self, data, decoded=None):
+        """Display image bytes on framebuffer, using the decoded surface if given"""
+        try:
+            if self._cached_surface is not None and data is self._cached_screenshot:
+                image = self._cached_surface
+                logger.debug("Reusing cached surface")
+            else:
+                image = self._transform(decoded if decoded is not None else self._decode(data))
+                if self.cache_enabled:
+                    self._cached_surface = image
+                    self._cached_screenshot = data
+
+            # A cache hit hands back the screenshot that is already on screen
+            if data is self._shown_screenshot:
+                logger.debug("Screen already up to date")
+                return
+
+            dirty_rect = self.screen.blit(image, (0, 0))
+            pygame.display.update(dirty_rect)
+            self._shown_screenshot = data
+            self._screen_on = True
+            logger.debug("Image displayed")
         except Exception as e:
-            logger.error(f"Error displaying image: {e}")
+            logger.error("Error displaying image: %s", e)
             raise
 
     def set_backlight(self, value):
         """Set backlight brightness"""
-        if not self.backlight_path:
+        if self._backlight_fd is None or value == self._last_backlight:
             return
 
         try:
-            with open(self.backlight_path, 'w') as f:
-                f.write(str(value))
-            logger.debug(f"Backlight set to {value}")
+            os.pwrite(self._backlight_fd, str(value).encode(), 0)
+            self._last_backlight = value
+            logger.debug("Backlight set to %s", value)
         except Exception as e:
-            logger.warning(f"Failed to set backlight: {e}")
+            logger.warning("Failed to set backlight: %s", e)
 
     def turn_off_screen(self):
         """Turn off screen by filling with black"""
-        self.screen.fill((0, 0, 0))
-        pygame.display.flip()
+        if self._screen_on:
+            pygame.display.update(self.screen.fill((0, 0, 0)))
+            self._shown_screenshot = None
+            self._screen_on = False
         self.set_backlight(0)
         logger.info("Screen turned off")
 
@@ -167,57 +708,144 @@ class ScreenDashboard:
         if not self.night_mode_enabled:
             return False
 
-        now = datetime.now().time()
+        now = time.localtime()
+        now_min = now.tm_hour * 60 + now.tm_min
 
-        try:
-            start_time = dt_time.fromisoformat(self.night_start)
-            end_time = dt_time.fromisoformat(self.night_end)
-        except ValueError as e:
-            logger.error(f"Invalid time format: {e}")
+        # Offsets from the start wrap past midnight, which also covers
+        # overnight ranges (e.g., 22:00 to 07:00)
+        start_min = self._night_start_min
+        return (now_min - start_min) % 1440 < (self._night_end_min - start_min) % 1440
+
+    def seconds_until_night_change(self):
+        """Seconds until night mode next starts or ends, None if night mode is off"""
+        if not self.night_mode_enabled:
+            return None
+
+        now = time.localtime()
+        now_sec = now.tm_hour * 3600 + now.tm_min * 60 + now.tm_sec
+        return min(
+            (boundary * 60 - now_sec) % 86400 or 86400
+            for boundary in (self._night_start_min, self._night_end_min)
+        )
+
+    def night_state_changed(self):
+        """Check if night mode started or ended since the last update"""
+        if self._last_state is None:
             return False
+        return (self._last_state == 'night') != self.is_night_time()
+
+    def request_screenshot(self):
+        """Start a screenshot on the capture thread"""
+        # Held until the capture's future is done
+        if not self._refresh_lock.acquire(blocking=False):
+            logger.warning("Previous screenshot still in progress after %.1fs, skipping refresh",
+                           time.monotonic() - self._last_refresh_start)
+            return
 
-        # Handle overnight ranges (e.g., 22:00 to 07:00)
-        if start_time > end_time:
-            return now >= start_time or now <= end_time
-        else:
-            return start_time <= now <= end_time
+        # Show a finished capture that has not been presented yet before replacing it
+        self.present_screenshot()
+        logger.debug("Updating display with %s", self.url)
+        self._dirty = False
+        self._retry_capture = False
+        self._last_refresh_start = time.monotonic()
+        try:
+            self._capture = self._executor.submit(self._capture_and_decode)
+        except Exception:
+            self._refresh_lock.release()
+            raise
+        self._capture.add_done_callback(self._capture_done)
+
+    def _capture_done(self, capture):
+        """Release the refresh lock and wake the main loop once a capture is done"""
+        # Releasing only now means a new refresh always sees this capture as done
+        self._refresh_lock.release()
+        self._wakeup.set()
+
+    def _capture_and_decode(self):
+        """Take a screenshot and decode it, both on the capture thread
+
+        Image decoding is CPU-bound, so doing it here keeps it off the main
+        thread; only the transform and blit are left for present_screenshot.
+        """
+        data = self.take_screenshot()
+        if data is self._cached_screenshot:
+            return data, None
+        return data, self._decode(data)
+
+    def present_screenshot(self):
+        """Display the finished screenshot, if there is one"""
+        if self._capture is None or not self._capture.done():
+            return
+
+        capture, self._capture = self._capture, None
+        try:
+            screenshot, decoded = capture.result()
+            # Night mode may have started while Chromium was busy
+            if self.is_night_time():
+                logger.info("Night time - discarding screenshot")
+                return
+            self.display_image(screenshot, decoded)
+            self.turn_on_screen()
+        except Exception as e:
+            logger.error("Error updating display: %s", e, exc_info=True)
+            # Retry on the next refresh instead of waiting for another change
+            self._retry_capture = True
+
+    def wait(self, timeout):
+        """Sleep for up to timeout seconds, displaying screenshots as they finish"""
+        self._wakeup.wait(timeout)
+        self._wakeup.clear()
+        self.present_screenshot()
 
     def update_display(self):
         """Main update function"""
         try:
-            if self.is_night_time():
-                logger.info("Night time - turning off screen")
-                self.turn_off_screen()
+            state = 'night' if self.is_night_time() else 'day'
+            if state == 'night':
+                # The screen is already dark if it was night on the last update
+                if state != self._last_state:
+                    logger.info("Night time - turning off screen")
+                    self.turn_off_screen()
             else:
-                logger.info(f"Updating display with {self.url}")
-                screenshot = self.take_screenshot()
-                self.display_image(screenshot)
-                self.turn_on_screen()
+                if state != self._last_state:
+                    logger.info("Day time - showing %s", self.url)
+                    self._dirty = True
+                if self._dirty or self._retry_capture or not self.subscribed:
+                    self.request_screenshot()
+                else:
+                    logger.debug("No change notification since last capture, skipping refresh")
+            self._last_state = state
         except Exception as e:
-            logger.error(f"Error updating display: {e}", exc_info=True)
+            logger.error("Error updating display: %s", e, exc_info=True)
 
 if __name__ == '__main__':
     logger.info("Starting Screen Dashboard")
 
+    dashboard = None
     try:
         dashboard = ScreenDashboard()
+        logger.info("Entering main loop")
 
-        # Schedule updates
-        schedule.every(dashboard.refresh_interval).seconds.do(dashboard.update_display)
-
-        # Initial update
-        dashboard.update_display()
+        # Sleep until the next refresh, night mode boundary or change notification
+        next_refresh = time.monotonic()
+        while True:
+            now = time.monotonic()
+            if now >= next_refresh or dashboard.night_state_changed() or dashboard.change_pending():
+                dashboard.update_display()
+                next_refresh = now + dashboard.refresh_interval
 
-        # Keep running
-        check_interval = int(os.getenv('CHECK_INTERVAL', '60'))
-        logger.info(f"Entering main loop (check every {check_interval}s)")
+            timeout = next_refresh - now
+            night_change = dashboard.seconds_until_night_change()
+            if night_change is not None:
+                timeout = min(timeout, night_change)
 
-        while True:
-            schedule.run_pending()
-            time.sleep(check_interval)
+            dashboard.wait(timeout)
 
     except KeyboardInterrupt:
         logger.info("Shutting down gracefully")
     except Exception as e:
-        logger.error(f"Fatal error: {e}", exc_info=True)
+        logger.error("Fatal error: %s", e, exc_info=True)
         raise
+    finally:
+        if dashboard is not None:
+            dashboard.close()